@@ -0,0 +1,84 @@
+import numpy as np
+
+# === Token-Level Alignment Index ===
+# Built once per set of records: every (word, tag) pair from identifiers whose
+# `split` and `grammar pattern` have the same length is stored as parallel
+# integer arrays, so word/category frequency queries become grouped counts.
+
+class AlignmentIndex:
+    def __init__(self, identifier_ids, positions, word_ids, tag_ids, words, tags, misaligned):
+        self.identifier_ids = identifier_ids
+        self.positions = positions
+        self.word_ids = word_ids
+        self.tag_ids = tag_ids
+        self.words = words
+        self.tags = tags
+        self.misaligned = misaligned
+
+        # word id -> lowercased word id, so case-folded queries need no re-scan
+        lower_vocab = {}
+        self.lower_word_ids = np.array(
+            [lower_vocab.setdefault(w.lower(), len(lower_vocab)) for w in words], dtype=np.int32
+        )
+        self.lower_words = list(lower_vocab)
+
+    def __len__(self):
+        return len(self.word_ids)
+
+
+def build_alignment_index(records, split_col="split", grammar_col="grammar pattern"):
+    word_vocab, tag_vocab = {}, {}
+    identifier_ids, positions, word_ids, tag_ids = [], [], [], []
+    misaligned = []
+
+    for identifier_id, row in enumerate(records):
+        split = row.get(split_col, "").strip().split()
+        pattern = row.get(grammar_col, "").strip().split()
+        if len(split) != len(pattern):
+            misaligned.append(identifier_id)
+            continue
+        for position, (word, tag) in enumerate(zip(split, pattern)):
+            identifier_ids.append(identifier_id)
+            positions.append(position)
+            word_ids.append(word_vocab.setdefault(word, len(word_vocab)))
+            tag_ids.append(tag_vocab.setdefault(tag, len(tag_vocab)))
+
+    return AlignmentIndex(
+        identifier_ids=np.array(identifier_ids, dtype=np.int32),
+        positions=np.array(positions, dtype=np.int16),
+        word_ids=np.array(word_ids, dtype=np.int32),
+        tag_ids=np.array(tag_ids, dtype=np.int16),
+        words=list(word_vocab),
+        tags=list(tag_vocab),
+        misaligned=np.array(misaligned, dtype=np.int32),
+    )
+
+
+# === Grouped Counts ===
+
+def count_words_by_group(index, tag_to_group, lowercase=False):
+    """Count words per group (e.g. closed category) for tags found in `tag_to_group`.
+
+    Returns {group: {word: count}}, with words ordered by first occurrence so
+    that ties in downstream `most_common` calls keep the scan order.
+    """
+    groups = sorted(set(tag_to_group.values()))
+    group_of_tag = np.array(
+        [groups.index(tag_to_group[t]) if t in tag_to_group else -1 for t in index.tags],
+        dtype=np.int32,
+    )
+    if lowercase:
+        word_ids, vocab = index.lower_word_ids[index.word_ids], index.lower_words
+    else:
+        word_ids, vocab = index.word_ids, index.words
+
+    token_groups = group_of_tag[index.tag_ids] if len(index) else np.empty(0, dtype=np.int32)
+    mask = token_groups >= 0
+    keys = token_groups[mask].astype(np.int64) * len(vocab) + word_ids[mask]
+    unique_keys, first_seen, counts = np.unique(keys, return_index=True, return_counts=True)
+
+    result = {}
+    for i in np.argsort(first_seen, kind="stable"):
+        group_id, word_id = divmod(int(unique_keys[i]), len(vocab))
+        result.setdefault(groups[group_id], {})[vocab[word_id]] = int(counts[i])
+    return result
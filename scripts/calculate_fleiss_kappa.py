@@ -3,6 +3,9 @@ import numpy as np
 from sklearn.preprocessing import LabelEncoder
 from statsmodels.stats.inter_rater import fleiss_kappa
 
+from data_loader import ANNOTATION_FILES, load_inputs
+from result_store import record_table, start_run
+
 def prepare_fleiss_matrix_single_axis(df, annotator_columns):
     all_annotations = []
     for col in annotator_columns:
@@ -44,14 +47,18 @@ def prepare_fleiss_matrix_composite_labels(df, annotator_pairs):
         matrix.append(counts)
     return np.array(matrix)
 
-def calculate_fleiss_kappa_single(file_path, sep="\t"):
-    df = pd.read_csv(file_path, sep=sep)
+def as_frame(data, sep="\t"):
+    # Accept either a file path or an already loaded DataFrame
+    return data if isinstance(data, pd.DataFrame) else pd.read_csv(data, sep=sep)
+
+def calculate_fleiss_kappa_single(data, sep="\t"):
+    df = as_frame(data, sep)
     annotator_cols = [col for col in df.columns if "Axial Code" in col]
     matrix = prepare_fleiss_matrix_single_axis(df, annotator_cols)
     return fleiss_kappa(matrix)
 
-def calculate_fleiss_kappa_dual(file_path, sep="\t"):
-    df = pd.read_csv(file_path, sep=sep)
+def calculate_fleiss_kappa_dual(data, sep="\t"):
+    df = as_frame(data, sep)
     annotator_pairs = [
         ("Christian Axial Code Role", "Christian Axial Code Meaning"),
         ("Syreen Axial Code Role", "Syreen Axial Code Meaning"),
@@ -60,8 +67,8 @@ def calculate_fleiss_kappa_dual(file_path, sep="\t"):
     matrix = prepare_fleiss_matrix_composite_labels(df, annotator_pairs)
     return fleiss_kappa(matrix)
 
-def calculate_fleiss_kappa_grammar_patterns(file_path, sep="\t"):
-    df = pd.read_csv(file_path, sep=sep)
+def calculate_fleiss_kappa_grammar_patterns(data, sep="\t"):
+    df = as_frame(data, sep)
     pattern_cols = [
         "Christian Grammar Pattern",
         "Syreen Grammar Pattern",
@@ -73,14 +80,18 @@ def calculate_fleiss_kappa_grammar_patterns(file_path, sep="\t"):
 
 # Example usage
 if __name__ == "__main__":
-    digit_file = "../data/Digit Axial Code Annotations - digit_axial_code_dual_axis.tsv"
-    determiner_file = "../data/Determiner Axial Code Anntoations - determiner_axial_code_validation.tsv"
-    preposition_file = "../data/Preposition Axial Code Annotations - refined_axial_code_labels_updated.tsv"
-    conjunction_file = "../data/Conjunction Axial Code Annotations - conjunction_axial_codes_final.tsv"
-    grammar_pattern_file = "../data/Tagger Open Coding - Name and Grammar Pattern.tsv"
+    inputs = load_inputs(annotations=ANNOTATION_FILES)
+    annotations = inputs.annotations
+
+    kappas = [
+        ("Digit", "dual-axis", calculate_fleiss_kappa_dual(annotations["Digit"])),
+        ("Determiner", "single-axis", calculate_fleiss_kappa_single(annotations["Determiner"])),
+        ("Preposition", "single-axis", calculate_fleiss_kappa_single(annotations["Preposition"])),
+        ("Conjunction", "single-axis", calculate_fleiss_kappa_single(annotations["Conjunction"])),
+        ("Grammar Pattern", "multi-annotator", calculate_fleiss_kappa_grammar_patterns(annotations["Full"])),
+    ]
+    for category, scheme, kappa in kappas:
+        print(f"{category} ({scheme}) Fleiss' Kappa:", kappa)
 
-    print("Digit (dual-axis) Fleiss' Kappa:", calculate_fleiss_kappa_dual(digit_file))
-    print("Determiner (single-axis) Fleiss' Kappa:", calculate_fleiss_kappa_single(determiner_file))
-    print("Preposition (single-axis) Fleiss' Kappa:", calculate_fleiss_kappa_single(preposition_file))
-    print("Conjunction (single-axis) Fleiss' Kappa:", calculate_fleiss_kappa_single(conjunction_file))
-    print("Grammar Pattern (multi-annotator) Fleiss' Kappa:", calculate_fleiss_kappa_grammar_patterns(grammar_pattern_file))
+    run_id = start_run("calculate_fleiss_kappa.py", inputs=ANNOTATION_FILES.values())
+    record_table(run_id, "fleiss_kappa", pd.DataFrame(kappas, columns=["category", "scheme", "kappa"]))
@@ -3,8 +3,12 @@ import numpy as np
 from scipy.stats import chi2_contingency, norm, chi2
 import os
 
+from data_loader import ANNOTATION_FILES, load_inputs
+from result_store import record_table, start_run
+
 # === Load Unified TSV File ===
-df = pd.read_csv("../data/Tagger Open Coding - Name and Grammar Pattern.tsv", sep='\t', dtype=str)
+input_file = ANNOTATION_FILES["Full"]
+df = load_inputs(annotations=["Full"]).annotations["Full"]
 
 # === Strip and Prepare Columns ===
 df['language'] = df['language'].str.strip()
@@ -14,6 +18,9 @@ df['grammar pattern'] = df['grammar pattern'].fillna('').str.strip()
 # === Closed-category Tags to Track ===
 closed_tags = ["D", "DT", "P", "CJ"]
 
+# === Significance Level ===
+ALPHA = 0.05
+
 # === Initialize Count Structures ===
 language_counts = {tag: {} for tag in closed_tags}
 context_counts = {tag: {} for tag in closed_tags}
@@ -53,9 +60,9 @@ def df_to_markdown(df, caption, bold_largest=True):
     return markdown + "\n"
 
 # === Chi-square Analysis ===
-def analyze_table(observed_table, output_prefix):
+def analyze_table(observed_table, output_prefix, run_id=None):
     chi2_stat, p_val, dof, expected = chi2_contingency(observed_table)
-    chi2_critical = chi2.ppf(0.95, dof)
+    chi2_critical = chi2.ppf(1 - ALPHA, dof)
     chi2_components = (observed_table - expected) ** 2 / expected
     chi2_components["Chi-square per row"] = chi2_components.sum(axis=1)
     chi2_components.loc["Chi-square per column"] = chi2_components.sum()
@@ -68,9 +75,8 @@ def analyze_table(observed_table, output_prefix):
     residuals = (observed_table - expected) / std_error
     residuals_df = pd.DataFrame(residuals, index=observed_table.index, columns=observed_table.columns)
 
-    alpha = 0.05
     num_tests = observed_table.size
-    critical_z = norm.ppf(1 - alpha / (2 * num_tests))
+    critical_z = norm.ppf(1 - ALPHA / (2 * num_tests))
 
     residuals_marked = residuals_df.copy().round(6).astype(str)
     sig_mask = residuals_df.abs() >= critical_z
@@ -80,16 +86,26 @@ def analyze_table(observed_table, output_prefix):
     os.makedirs("../output", exist_ok=True)
     chi2_components.to_csv(f"../output/chi2_{output_prefix}.csv")
     residuals_marked.to_csv(f"../output/adjusted_residuals_{output_prefix}.csv")
+    if run_id is not None:
+        record_table(run_id, f"observed_{output_prefix}", observed_table, index_label="tag")
+        record_table(run_id, f"chi2_{output_prefix}", chi2_components, index_label="tag")
+        residuals_record = residuals_df.copy()
+        residuals_record["critical_z"] = critical_z
+        record_table(run_id, f"adjusted_residuals_{output_prefix}", residuals_record, index_label="tag")
+        record_table(run_id, f"chi2_test_{output_prefix}", pd.DataFrame([{
+            "chi2": chi2_stat, "p_value": p_val, "dof": dof, "chi2_critical": chi2_critical,
+            "alpha": ALPHA, "num_tests": num_tests, "critical_z": critical_z,
+        }]))
 
     chi2_header = (
-        f"Results of Pearson’s Chi Squared Test. df = {dof}, α = {alpha}, "
+        f"Results of Pearson’s Chi Squared Test. df = {dof}, α = {ALPHA}, "
         f"critical value = {chi2_critical:.3f}, test statistic = {chi2_stat:.3f}\n\n"
     )
-    bonferroni_alpha = alpha / num_tests
+    bonferroni_alpha = ALPHA / num_tests
     bonferroni_header = (
         f"Standardized Pearson Residuals. These residuals account for marginal effects and help identify which cells most strongly contribute to the overall association.\n\n"
         f"Bonferroni Correction: While the global chi-squared test evaluates independence, the Bonferroni-adjusted z-threshold highlights cells with unusually high deviation. "
-        f"Significance threshold: α = {alpha:.2f}/{num_tests} = {bonferroni_alpha:.4f}, which translates to a ± {critical_z:.2f} z-score.\n\n"
+        f"Significance threshold: α = {ALPHA:.2f}/{num_tests} = {bonferroni_alpha:.4f}, which translates to a ± {critical_z:.2f} z-score.\n\n"
     )
 
     chi2_md = chi2_header + df_to_markdown(chi2_components.round(6), f"Chi-Square Contributions: {output_prefix.replace('_', ' ').title()}")
@@ -102,5 +118,6 @@ def analyze_table(observed_table, output_prefix):
         f.write(residuals_md)
 
 # === Run Analysis ===
-analyze_table(tag_language_table, "tag_language")
-analyze_table(tag_context_table, "tag_context")
+run_id = start_run("chi_square.py", {"closed_tags": closed_tags, "alpha": ALPHA}, inputs=[input_file])
+analyze_table(tag_language_table, "tag_language", run_id)
+analyze_table(tag_context_table, "tag_context", run_id)
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+# === Shared Input Loader ===
+# All annotation TSVs, system statistics CSVs and Markdown templates are read
+# concurrently on a thread pool (the pandas C parser releases the GIL), so
+# start-up on slow or network-mounted storage costs roughly the slowest file.
+
+DATA_DIR = Path("../data")
+
+CATEGORIES = ["Determiner", "Digit", "Preposition", "Conjunction"]
+
+ANNOTATION_FILES = {
+    "Full": DATA_DIR / "Tagger Open Coding - Name and Grammar Pattern.tsv",
+    "Determiner": DATA_DIR / "Determiner Axial Code Anntoations - determiner_axial_code_validation.tsv",
+    "Digit": DATA_DIR / "Digit Axial Code Annotations - digit_axial_code_dual_axis.tsv",
+    "Preposition": DATA_DIR / "Preposition Axial Code Annotations - refined_axial_code_labels_updated.tsv",
+    "Conjunction": DATA_DIR / "Conjunction Axial Code Annotations - conjunction_axial_codes_final.tsv",
+}
+
+SYSTEM_STATS_FILES = {
+    "domain": DATA_DIR / "word_system_stats_with_sloc_domain.csv",
+    "general": DATA_DIR / "word_system_stats_with_sloc_general.csv",
+}
+
+TEMPLATE_FILES = {
+    "Determiner": DATA_DIR / "Determiner_Selective_Code_Summary.md",
+    "Digit": DATA_DIR / "Digit_Selective_Codes_Dual_Axis.md",
+    "Preposition": DATA_DIR / "Preposition_Selective_Code_Summary.md",
+    "Conjunction": DATA_DIR / "Conjunction_Selective_Code_Summary.md",
+}
+
+
+@dataclass(frozen=True)
+class InputBundle:
+    annotations: dict[str, pd.DataFrame] = field(default_factory=dict)
+    system_stats: dict[str, pd.DataFrame] = field(default_factory=dict)
+    templates: dict[str, str] = field(default_factory=dict)
+
+    def records(self, name: str) -> list[dict[str, str]]:
+        """Annotation rows as csv.DictReader-style dicts (empty cells as "")."""
+        return self.annotations[name].fillna("").to_dict(orient="records")
+
+
+def read_annotations(path) -> pd.DataFrame:
+    # Keep every cell as text; only empty cells count as missing, so labels
+    # such as "None" or "NA" survive as annotations.
+    return pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False, na_values=[""])
+
+def read_system_stats(path) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+def read_template(path) -> str:
+    return Path(path).read_text()
+
+
+def load_inputs(annotations=(), system_stats=(), templates=(), max_workers=None) -> InputBundle:
+    """Load the named inputs concurrently, e.g. `load_inputs(annotations=CATEGORIES)`."""
+    jobs = (
+        [("annotations", name, read_annotations, ANNOTATION_FILES[name]) for name in annotations]
+        + [("system_stats", name, read_system_stats, SYSTEM_STATS_FILES[name]) for name in system_stats]
+        + [("templates", name, read_template, TEMPLATE_FILES[name]) for name in templates]
+    )
+    loaded = {"annotations": {}, "system_stats": {}, "templates": {}}
+    if not jobs:
+        return InputBundle()
+    with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+        futures = [(kind, name, pool.submit(reader, path)) for kind, name, reader, path in jobs]
+        for kind, name, future in futures:
+            loaded[kind][name] = future.result()
+    return InputBundle(**loaded)
@@ -27,22 +27,15 @@ def print_closed_category_context_breakdown(name, records):
             pct_context = (count / context_total * 100) if context_total > 0 else 0
             pct_category = (count / category_total * 100) if category_total > 0 else 0
             print(f"    {context}: {count} ({pct_context:.2f}% of context out of {context_total}, {pct_category:.2f}% of {category} out of {category_total})")
-def count_closed_category_words(records):
-    word_counter = defaultdict(Counter)
-    for row in records:
-        split = row.get("split", "").strip().split()
-        pattern = row.get("grammar pattern", "").strip().split()
-        if len(split) != len(pattern):
-            continue
-        for word, tag in zip(split, pattern):
-            category = tag_to_category.get(tag)
-            if category:
-                word_counter[category][word.lower()] += 1
-    return word_counter
+def count_closed_category_words(index, lowercase=True):
+    counts = count_words_by_group(index, tag_to_category, lowercase=lowercase)
+    return defaultdict(Counter, {category: Counter(words) for category, words in counts.items()})
 
-def print_closed_category_word_summary(name, records):
+def print_closed_category_word_summary(name, index):
     print(f"\n{name} — Top Closed Category Words:")
-    word_counter = count_closed_category_words(records)
+    if len(index.misaligned):
+        print(f"  Skipped {len(index.misaligned)} identifiers whose split and grammar pattern lengths differ")
+    word_counter = count_closed_category_words(index)
     for category in sorted(word_counter):
         print(f"  {category}:")
         total = sum(word_counter[category].values())
@@ -69,28 +62,17 @@ def print_closed_category_identifier_summary(name, records):
         print(f"  {category}: {count} ({(count/total_identifiers)*100:.2f}%)")
 
 import os
-import csv
 from collections import Counter, defaultdict
 
-# File paths
-files = {
-    "Full": "../data/Tagger Open Coding - Name and Grammar Pattern.tsv",
-    "Determiner": "../data/Determiner Axial Code Anntoations - determiner_axial_code_validation.tsv",
-    "Digit": "../data/Digit Axial Code Annotations - digit_axial_code_dual_axis.tsv",
-    "Preposition": "../data/Preposition Axial Code Annotations - refined_axial_code_labels_updated.tsv",
-    "Conjunction": "../data/Conjunction Axial Code Annotations - conjunction_axial_codes_final.tsv",
-}
+from alignment_index import build_alignment_index, count_words_by_group
+from data_loader import ANNOTATION_FILES, CATEGORIES, load_inputs
+from pattern_index import build_pattern_index, position_stats, top_ngrams
 
 # Target categories and languages
 target_languages = {"C", "C++", "Java"}
 tag_to_category = {"DT": "Determiner", "D": "Digit", "P": "Preposition", "CJ": "Conjunction"}
 
 # Helpers
-def process_file(file_path):
-    with open(file_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        return list(reader)
-
 def count_by_column(records, column, valid_values):
     counter = Counter()
     for row in records:
@@ -99,18 +81,8 @@ def count_by_column(records, column, valid_values):
             counter[val] += 1
     return counter
 
-def top_closed_category_words(records):
-    word_counter = defaultdict(Counter)
-    for row in records:
-        split = row.get("split", "").strip().split()
-        pattern = row.get("grammar pattern", "").strip().split()
-        if len(split) != len(pattern):
-            continue
-        for word, tag in zip(split, pattern):
-            category = tag_to_category.get(tag)
-            if category:
-                word_counter[category][word] += 1
-    return word_counter
+def top_closed_category_words(index):
+    return count_closed_category_words(index, lowercase=False)
 
 def summarize_records(name, records):
     print(f"\n{name} — Language Counts")
@@ -217,19 +189,55 @@ def summarize_records(name, records):
             pct = (count / total * 100) if total > 0 else 0
             print(f"    {pat}: {count} ({pct:.2f}%)")
 
+def print_closed_category_ngram_summary(name, records, ngram_sizes=(2, 3), top_k=10, group_top_k=5):
+    print(f"\n{name} — Most common tag n-grams per closed-category:")
+    index = build_pattern_index(records, max_n=max(ngram_sizes))
+    category_tags = defaultdict(list)
+    for tag, category in tag_to_category.items():
+        category_tags[category].append(tag)
+
+    for category in sorted(category_tags):
+        tags = category_tags[category]
+        for n in ngram_sizes:
+            top = top_ngrams(index, n, k=top_k, containing=tags)
+            if not top:
+                continue
+            total = sum(count for _, count in top_ngrams(index, n, k=None, containing=tags))
+            print(f"  {category} ({n}-grams):")
+            for pat, count in top:
+                pct = (count / total * 100) if total > 0 else 0
+                where = position_stats(index, pat)
+                where = ", ".join(f"{k} {v}" for k, v in where.items() if v)
+                print(f"    {pat}: {count} ({pct:.2f}%) [{where}]")
+
+        n = max(ngram_sizes)
+        for group_col in ("language", "context"):
+            per_group = top_ngrams(index, n, k=group_top_k, containing=tags, group_by=group_col)
+            for group, top in per_group.items():
+                if not top or (group_col == "language" and group not in target_languages):
+                    continue
+                print(f"  {category} ({n}-grams, {group_col} = {group}):")
+                for pat, count in top:
+                    print(f"    {pat}: {count}")
+
+# Load all inputs concurrently
+inputs = load_inputs(annotations=ANNOTATION_FILES)
+
 # Global Report
 print("\n=== GLOBAL REPORT ===")
-full_records = process_file(files["Full"])
+full_records = inputs.records("Full")
 summarize_records("Global", full_records)
 print_closed_category_identifier_summary("Global", full_records)
 print_closed_category_context_breakdown("Global", full_records)
-print_closed_category_word_summary("Global", full_records)
+print_closed_category_word_summary("Global", build_alignment_index(full_records))
+print_closed_category_ngram_summary("Global", full_records)
 
 # Per-Closed-Category Reports
 print("\n=== PER-CLOSED-CATEGORY REPORTS ===")
-for category in ["Determiner", "Digit", "Preposition", "Conjunction"]:
+for category in CATEGORIES:
     print(f"\n--- {category.upper()} REPORT ---")
-    records = process_file(files[category])
+    records = inputs.records(category)
     summarize_records(category, records)
     print_closed_category_identifier_summary(category, records)
-    print_closed_category_word_summary(category, records)
+    print_closed_category_word_summary(category, build_alignment_index(records))
+    print_closed_category_ngram_summary(category, records)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+# === Outlier and Coverage Filters ===
+# Robust outlier filters on a word-system table, applied globally or within
+# each word/system group. Bounds are computed with grouped transforms in a
+# single pass per scope, and SweepFilter caches the filtered table plus the
+# per-word system coverage so a threshold sweep only re-applies a comparison.
+
+METHODS = ("sigma", "mad", "iqr")
+SCOPES = ("global", "word", "system")
+DEFAULT_K = {"sigma": 3.0, "mad": 3.5, "iqr": 1.5}
+
+# Scales the MAD / mean absolute deviation to a standard deviation for
+# normally distributed data, and a standard deviation to an IQR
+MAD_SCALE = 1.4826
+MEANAD_SCALE = 1.2533
+IQR_PER_SIGMA = 1.349
+
+
+def variant_name(method, scope, k=None):
+    name = f"{method}/{scope}"
+    return name if k is None or k == DEFAULT_K[method] else f"{name}/k={k:g}"
+
+def _group_stats(df, col, scope, methods):
+    values = df[col]
+    keys = pd.Series(0, index=df.index) if scope == "global" else df[scope]
+    grouped = values.groupby(keys)
+
+    stats = {}
+    if "sigma" in methods:
+        stats["mean"] = grouped.transform("mean")
+        stats["std"] = grouped.transform("std")
+    if "mad" in methods or "iqr" in methods:
+        stats["median"] = grouped.transform("median")
+        deviations = (values - stats["median"]).abs().groupby(keys)
+        # Fallback spread when more than half of a group shares one value
+        stats["meanad"] = deviations.transform("mean") * MEANAD_SCALE
+    if "mad" in methods:
+        stats["mad"] = deviations.transform("median") * MAD_SCALE
+    if "iqr" in methods:
+        quartiles = grouped.quantile([0.25, 0.75]).unstack()
+        stats["q1"] = keys.map(quartiles[0.25])
+        stats["q3"] = keys.map(quartiles[0.75])
+    return stats
+
+def _bounds(stats, method, k):
+    if method == "sigma":
+        spread = stats["std"]
+        return stats["mean"] - k * spread, stats["mean"] + k * spread, spread
+    if method == "mad":
+        spread = stats["mad"].where(stats["mad"] > 0, stats["meanad"])
+        return stats["median"] - k * spread, stats["median"] + k * spread, spread
+    spread = stats["q3"] - stats["q1"]
+    spread = spread.where(spread > 0, stats["meanad"] * IQR_PER_SIGMA)
+    return stats["q1"] - k * spread, stats["q3"] + k * spread, spread
+
+def outlier_masks(df, variants, col="normalized_system_count"):
+    """Boolean keep-masks for several (method, scope, k) variants at once.
+
+    Returns a DataFrame aligned with `df` with one column per variant (see
+    `variant_name`); `k=None` uses DEFAULT_K. Bounds are inclusive. When the
+    MAD or IQR of a group is 0 although its values differ (more than half, or
+    the middle half, share one value), the scaled mean absolute deviation
+    around the median is used instead. Groups with a single row or identical
+    values are left unfiltered. Statistics are computed once per scope.
+    """
+    for method, scope, _ in variants:
+        if method not in METHODS:
+            raise ValueError(f"Unknown outlier method {method!r}; expected one of {METHODS}")
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown outlier scope {scope!r}; expected one of {SCOPES}")
+
+    masks = {}
+    for scope in dict.fromkeys(scope for _, scope, _ in variants):
+        scope_variants = [v for v in variants if v[1] == scope]
+        stats = _group_stats(df, col, scope, {method for method, _, _ in scope_variants})
+        for method, _, k in scope_variants:
+            lower, upper, spread = _bounds(stats, method, DEFAULT_K[method] if k is None else k)
+            unfiltered = spread.isna() | (spread == 0)
+            masks[variant_name(method, scope, k)] = unfiltered | ((df[col] >= lower) & (df[col] <= upper))
+    return pd.DataFrame(masks, index=df.index)
+
+
+# === Threshold Sweep ===
+
+class SweepFilter:
+    """Outlier-filtered, log-transformed table with cached per-word coverage.
+
+    `at(threshold)` keeps words found in at least `threshold` of the systems
+    remaining after outlier removal, without regrouping the table.
+    """
+
+    def __init__(self, df, col="normalized_system_count"):
+        df = df.copy()
+        df["log_" + col] = np.log10(df[col] + 1e-8)
+        self.df = df
+        self.total_systems = df["system"].nunique()
+        self.word_system_counts = df.groupby("word")["system"].transform("nunique")
+
+    def at(self, threshold):
+        return self.df[self.word_system_counts >= (self.total_systems * threshold)]
+
+def sweep_filters(df, variants, col="normalized_system_count"):
+    """One SweepFilter per (method, scope, k) variant, keyed by `variant_name`."""
+    masks = outlier_masks(df, variants, col=col)
+    return {name: SweepFilter(df[masks[name]], col=col) for name in masks.columns}
@@ -0,0 +1,154 @@
+import numpy as np
+
+# === Grammar Pattern N-gram Index ===
+# Grammar patterns are integer-encoded once and, for every n up to `max_n`,
+# all tag windows are sorted by their encoded key (a suffix array truncated at
+# depth n). Each distinct n-gram is then a contiguous run of postings, so
+# lookups are a binary search and top-k/grouped counts are array operations.
+
+class PatternIndex:
+    def __init__(self, tags, token_tags, token_identifiers, token_positions, identifier_lengths, groups, max_n):
+        self.tags = tags
+        self.tag_ids = {tag: i for i, tag in enumerate(tags)}
+        self.token_tags = token_tags
+        self.token_identifiers = token_identifiers
+        self.token_positions = token_positions
+        self.identifier_lengths = identifier_lengths
+        self.groups = groups
+        self.max_n = max_n
+        self.base = max(len(tags), 1)
+        if self.base ** max_n >= np.iinfo(np.int64).max:
+            raise ValueError(f"max_n={max_n} is too large for a tag vocabulary of {len(tags)}")
+        self.levels = {n: self._build_level(n) for n in range(1, max_n + 1)}
+
+    def _build_level(self, n):
+        valid = self.token_positions + n <= self.identifier_lengths[self.token_identifiers]
+        starts = np.nonzero(valid)[0]
+        keys = np.zeros(len(starts), dtype=np.int64)
+        for offset in range(n):
+            keys = keys * self.base + self.token_tags[starts + offset]
+        order = np.argsort(keys, kind="stable")
+        keys, starts = keys[order], starts[order]
+        unique_keys, offsets, counts = np.unique(keys, return_index=True, return_counts=True)
+        return {"keys": unique_keys, "offsets": offsets, "counts": counts, "starts": starts}
+
+    def encode(self, pattern):
+        key = 0
+        for tag in pattern.split():
+            if tag not in self.tag_ids:
+                return None
+            key = key * self.base + self.tag_ids[tag]
+        return key
+
+    def decode(self, keys, n):
+        keys = np.asarray(keys, dtype=np.int64)
+        digits = np.empty((len(keys), n), dtype=np.int64)
+        for offset in range(n - 1, -1, -1):
+            keys, digits[:, offset] = np.divmod(keys, self.base)
+        return digits
+
+    def postings(self, pattern):
+        """Flat token indices at which `pattern` (e.g. "N P N") starts."""
+        n = len(pattern.split())
+        if not 1 <= n <= self.max_n:
+            raise ValueError(f"Pattern length must be between 1 and {self.max_n}: {pattern!r}")
+        key = self.encode(pattern)
+        level = self.levels[n]
+        i = np.searchsorted(level["keys"], key) if key is not None else len(level["keys"])
+        if i == len(level["keys"]) or level["keys"][i] != key:
+            return np.empty(0, dtype=np.int64)
+        start = level["offsets"][i]
+        return level["starts"][start:start + level["counts"][i]]
+
+
+def build_pattern_index(records, max_n=4, grammar_col="grammar pattern", group_cols=("language", "context")):
+    tag_vocab = {}
+    token_tags, token_identifiers, token_positions = [], [], []
+    identifier_lengths = []
+    group_values = {col: [] for col in group_cols}
+
+    for identifier_id, row in enumerate(records):
+        pattern = row.get(grammar_col, "").strip().split()
+        identifier_lengths.append(len(pattern))
+        for col in group_cols:
+            group_values[col].append(row.get(col, "").strip())
+        for position, tag in enumerate(pattern):
+            token_tags.append(tag_vocab.setdefault(tag, len(tag_vocab)))
+            token_identifiers.append(identifier_id)
+            token_positions.append(position)
+
+    groups = {}
+    for col, values in group_values.items():
+        labels, codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+        groups[col] = (labels.tolist(), codes.astype(np.int32))
+
+    return PatternIndex(
+        tags=list(tag_vocab),
+        token_tags=np.array(token_tags, dtype=np.int64),
+        token_identifiers=np.array(token_identifiers, dtype=np.int32),
+        token_positions=np.array(token_positions, dtype=np.int32),
+        identifier_lengths=np.array(identifier_lengths, dtype=np.int32),
+        groups=groups,
+        max_n=max_n,
+    )
+
+
+# === Queries ===
+
+def _top_k(keys, counts, k):
+    order = np.lexsort((keys, -counts))[:k]
+    return keys[order], counts[order]
+
+def top_ngrams(index, n, k=15, containing=None, group_by=None):
+    """Most frequent tag n-grams as [(pattern, count)], optionally per group.
+
+    `k=None` returns every n-gram. `containing` restricts results to n-grams
+    with at least one of the given tags; `group_by` is a column passed to
+    `build_pattern_index` (e.g. "language"), in which case a
+    {group: [(pattern, count)]} dict is returned.
+    """
+    if not 1 <= n <= index.max_n:
+        raise ValueError(f"N-gram length must be between 1 and {index.max_n}: {n}")
+    level = index.levels[n]
+    keep = np.ones(len(level["keys"]), dtype=bool)
+    if containing is not None:
+        wanted = [index.tag_ids[t] for t in containing if t in index.tag_ids]
+        keep = np.isin(index.decode(level["keys"], n), wanted).any(axis=1)
+    ngram_ids = np.nonzero(keep)[0]
+
+    def as_patterns(keys):
+        return [" ".join(index.tags[t] for t in row) for row in index.decode(keys, n)]
+
+    if group_by is None:
+        keys, counts = _top_k(level["keys"][ngram_ids], level["counts"][ngram_ids], k)
+        return list(zip(as_patterns(keys), counts.tolist()))
+
+    labels, codes = index.groups[group_by]
+    # Postings are stored sorted by n-gram, so each posting's n-gram id is a repeat
+    posting_ngrams = np.repeat(np.arange(len(level["keys"])), level["counts"])
+    posting_groups = codes[index.token_identifiers[level["starts"]]]
+    pair_counts = np.bincount(
+        posting_ngrams * len(labels) + posting_groups, minlength=len(level["keys"]) * len(labels)
+    ).reshape(len(level["keys"]), len(labels))[ngram_ids]
+
+    result = {}
+    for group_id, label in enumerate(labels):
+        counts = pair_counts[:, group_id]
+        present = counts > 0
+        keys, counts = _top_k(level["keys"][ngram_ids][present], counts[present], k)
+        result[label] = list(zip(as_patterns(keys), counts.tolist()))
+    return result
+
+def position_stats(index, pattern):
+    """Where `pattern` occurs inside identifiers: whole, start, end or interior."""
+    starts = index.postings(pattern)
+    n = len(pattern.split())
+    positions = index.token_positions[starts]
+    at_end = positions + n == index.identifier_lengths[index.token_identifiers[starts]]
+    at_start = positions == 0
+    return {
+        "whole": int(np.sum(at_start & at_end)),
+        "start": int(np.sum(at_start & ~at_end)),
+        "end": int(np.sum(~at_start & at_end)),
+        "interior": int(np.sum(~at_start & ~at_end)),
+    }
@@ -0,0 +1,332 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# === Persistent Result Store ===
+# Every script run is recorded in a local SQLite file together with its
+# parameters, the SHA-256 of each input file and its result tables. Rows are
+# stored as JSON, with threshold/category/tag/variant pulled out into indexed
+# columns so specific statistics can be compared across runs without the CSVs.
+
+DEFAULT_DB = "../output/results.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    parameters TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_inputs (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (run_id, path)
+);
+CREATE TABLE IF NOT EXISTS result_tables (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    name TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    key_columns TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS result_rows (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    threshold REAL,
+    category TEXT,
+    tag TEXT,
+    variant TEXT,
+    data TEXT NOT NULL,
+    FOREIGN KEY (run_id, name) REFERENCES result_tables(run_id, name)
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_result_rows_run ON result_rows(run_id, name);
+CREATE INDEX IF NOT EXISTS idx_result_rows_threshold ON result_rows(name, threshold);
+CREATE INDEX IF NOT EXISTS idx_result_rows_category ON result_rows(name, category);
+CREATE INDEX IF NOT EXISTS idx_result_rows_tag ON result_rows(name, tag);
+CREATE INDEX IF NOT EXISTS idx_result_rows_variant ON result_rows(name, variant);
+CREATE INDEX IF NOT EXISTS idx_run_inputs_sha256 ON run_inputs(sha256);
+"""
+
+# Columns added after the first version of the schema, for existing stores.
+# Tables recorded before key_columns existed (NULL) use LEGACY_KEYS.
+LEGACY_KEYS = ("threshold", "category", "tag")
+MIGRATIONS = {
+    "result_tables": {"key_columns": "TEXT"},
+    "result_rows": {"variant": "TEXT"},
+}
+
+def connect(db_path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    for table, added in MIGRATIONS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in added.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    conn.executescript(INDEXES)
+    return conn
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# === Recording ===
+
+def start_run(script, parameters=None, inputs=(), db_path=DEFAULT_DB):
+    with connect(db_path) as conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (script, started_at, parameters) VALUES (?, ?, ?)",
+            (
+                script,
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                json.dumps(parameters or {}, sort_keys=True, default=str),
+            ),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO run_inputs (run_id, path, sha256) VALUES (?, ?, ?)",
+            [(run_id, os.path.normpath(path), file_sha256(path)) for path in inputs],
+        )
+    conn.close()
+    return run_id
+
+def record_table(run_id, name, df, db_path=DEFAULT_DB, index_label=None,
+                 threshold_col="threshold", category_col="category", tag_col="tag", variant_col=None):
+    """Store `df` as result table `name` of `run_id`.
+
+    Pass `index_label` to keep the DataFrame index as a column (e.g. the tag
+    index of the chi-square tables). The `*_col` arguments name the columns
+    copied into the indexed threshold/category/tag/variant fields (e.g.
+    `variant_col="filter"`); those present in `df` also become the table's
+    default keys for `compare_runs`, and the others are stored as NULL.
+    """
+    if index_label is not None:
+        df = df.rename_axis(index_label).reset_index()
+    columns = [str(c) for c in df.columns]
+    key_columns = [c for c in (threshold_col, category_col, tag_col, variant_col) if c in columns]
+    records = df.to_dict(orient="records")
+
+    def key(row, col, cast):
+        value = row.get(col) if col is not None else None
+        return None if value is None or pd.isna(value) else cast(value)
+
+    rows = [
+        (
+            run_id, name, i,
+            key(row, threshold_col, float),
+            key(row, category_col, str),
+            key(row, tag_col, str),
+            key(row, variant_col, str),
+            json.dumps({str(k): v for k, v in row.items()}, default=str),
+        )
+        for i, row in enumerate(records)
+    ]
+    with connect(db_path) as conn:
+        conn.execute("DELETE FROM result_rows WHERE run_id = ? AND name = ?", (run_id, name))
+        conn.execute(
+            "INSERT OR REPLACE INTO result_tables (run_id, name, columns, key_columns) VALUES (?, ?, ?, ?)",
+            (run_id, name, json.dumps(columns), json.dumps(key_columns)),
+        )
+        conn.executemany(
+            "INSERT INTO result_rows (run_id, name, row_number, threshold, category, tag, variant, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    conn.close()
+
+
+# === Queries ===
+
+def list_runs(db_path=DEFAULT_DB, script=None):
+    with connect(db_path) as conn:
+        sql = (
+            "SELECT r.run_id, r.script, r.started_at, r.parameters, "
+            "GROUP_CONCAT(t.name, ', ') AS tables "
+            "FROM runs r LEFT JOIN result_tables t ON t.run_id = r.run_id "
+        )
+        params = []
+        if script:
+            sql += "WHERE r.script = ? "
+            params.append(script)
+        sql += "GROUP BY r.run_id ORDER BY r.run_id"
+        runs = pd.read_sql_query(sql, conn, params=params)
+    conn.close()
+    return runs
+
+def run_inputs(run_id, db_path=DEFAULT_DB):
+    with connect(db_path) as conn:
+        inputs = pd.read_sql_query(
+            "SELECT path, sha256 FROM run_inputs WHERE run_id = ? ORDER BY path", conn, params=[run_id]
+        )
+    conn.close()
+    return inputs
+
+def latest_run(name, db_path=DEFAULT_DB):
+    with connect(db_path) as conn:
+        row = conn.execute("SELECT MAX(run_id) FROM result_tables WHERE name = ?", (name,)).fetchone()
+    conn.close()
+    if row[0] is None:
+        raise ValueError(f"No run recorded table {name!r}")
+    return row[0]
+
+def table_columns(name, run_ids=None, db_path=DEFAULT_DB):
+    """Columns and default key columns of table `name`, merged over `run_ids`."""
+    if run_ids is None:
+        run_ids = [latest_run(name, db_path)]
+    sql, params = "SELECT run_id, columns, key_columns FROM result_tables WHERE name = ?", [name]
+    if run_ids != "all":
+        run_ids = [run_ids] if isinstance(run_ids, int) else list(run_ids)
+        sql += f" AND run_id IN ({', '.join('?' * len(run_ids))})"
+        params.extend(run_ids)
+    with connect(db_path) as conn:
+        stored = conn.execute(sql + " ORDER BY run_id", params).fetchall()
+    conn.close()
+    if not stored:
+        raise ValueError(f"No run recorded table {name!r}"
+                         + ("" if run_ids == "all" else f" among runs {run_ids}"))
+    missing = [] if run_ids == "all" else sorted(set(run_ids) - {r[0] for r in stored})
+    if missing:
+        raise ValueError(f"Runs {missing} did not record table {name!r}")
+    columns, keys = {}, {}
+    for _, stored_columns, stored_keys in stored:
+        stored_columns = json.loads(stored_columns)
+        stored_keys = [c for c in LEGACY_KEYS if c in stored_columns] if stored_keys is None else json.loads(stored_keys)
+        columns.update(dict.fromkeys(stored_columns))
+        keys.update(dict.fromkeys(stored_keys))
+    return list(columns), list(keys)
+
+def query(name, run_ids=None, threshold=None, category=None, tag=None, variant=None, db_path=DEFAULT_DB):
+    """Rows of result table `name`, with a leading `run_id` column.
+
+    Defaults to the latest run that recorded the table; `run_ids="all"`
+    returns every run. Raises ValueError if no requested run recorded it.
+    """
+    if run_ids is None:
+        run_ids = [latest_run(name, db_path)]
+    columns, _ = table_columns(name, run_ids, db_path)
+    conditions, params = ["name = ?"], [name]
+    if run_ids != "all":
+        run_ids = [run_ids] if isinstance(run_ids, int) else list(run_ids)
+        conditions.append(f"run_id IN ({', '.join('?' * len(run_ids))})")
+        params.extend(run_ids)
+    if threshold is not None:
+        conditions.append("ROUND(threshold, 6) = ROUND(?, 6)")
+        params.append(float(threshold))
+    for column, value in (("category", category), ("tag", tag), ("variant", variant)):
+        if value is not None:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+
+    with connect(db_path) as conn:
+        rows = conn.execute(
+            f"SELECT run_id, data FROM result_rows WHERE {' AND '.join(conditions)} "
+            "ORDER BY run_id, row_number",
+            params,
+        ).fetchall()
+    conn.close()
+    return pd.DataFrame(
+        [{"run_id": run_id, **json.loads(data)} for run_id, data in rows],
+        columns=["run_id", *columns],
+    )
+
+def compare_runs(name, value_col, run_ids, on=None, db_path=DEFAULT_DB):
+    """One row per key in `on`, one `value_col` column per run.
+
+    `on` defaults to the key columns the table was recorded with. Raises
+    ValueError for unknown columns, or if a key does not identify a single
+    row per run (pass more key columns in that case).
+    """
+    columns, default_keys = table_columns(name, run_ids, db_path)
+    keys = list(default_keys if on is None else on)
+    unknown = [col for col in [value_col, *keys] if col not in columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s) {unknown} in table {name!r}; available: {columns}")
+
+    df = query(name, run_ids=run_ids, db_path=db_path)
+    if not keys:
+        # Tables without key columns (e.g. single-row test summaries) line up by row
+        df["row"] = df.groupby("run_id").cumcount()
+        keys = ["row"]
+    duplicated = df.duplicated(keys + ["run_id"], keep=False)
+    if duplicated.any():
+        example = df.loc[duplicated, keys].iloc[0].to_dict()
+        raise ValueError(
+            f"Key {keys} does not identify a single row of {name!r} per run (e.g. {example}); "
+            f"pass more key columns (--on) from {columns}"
+        )
+    return df.pivot(index=keys, columns="run_id", values=value_col)
+
+
+# === CLI ===
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query stored analysis results.")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_cmd = commands.add_parser("runs", help="List recorded runs")
+    runs_cmd.add_argument("--script")
+
+    inputs_cmd = commands.add_parser("inputs", help="Show input file hashes of a run")
+    inputs_cmd.add_argument("run_id", type=int)
+
+    show_cmd = commands.add_parser("show", help="Show a result table")
+    show_cmd.add_argument("name")
+    show_cmd.add_argument("--run", type=int, nargs="*", help="Run ids (default: latest; no value: all)")
+    show_cmd.add_argument("--threshold", type=float)
+    show_cmd.add_argument("--category")
+    show_cmd.add_argument("--tag")
+    show_cmd.add_argument("--variant")
+    show_cmd.add_argument("--columns", nargs="+")
+
+    compare_cmd = commands.add_parser("compare", help="Compare one column of a result table across runs")
+    compare_cmd.add_argument("name")
+    compare_cmd.add_argument("column")
+    compare_cmd.add_argument("--run", type=int, nargs="+", required=True)
+    compare_cmd.add_argument("--on", nargs="+", help="Key columns (default: the table's recorded keys)")
+
+    args = parser.parse_args(argv)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_rows", None)
+
+    if args.command == "runs":
+        print(list_runs(args.db, script=args.script).to_string(index=False))
+    elif args.command == "inputs":
+        print(run_inputs(args.run_id, args.db).to_string(index=False))
+    elif args.command == "show":
+        run_ids = None if args.run is None else (args.run or "all")
+        try:
+            df = query(args.name, run_ids=run_ids, threshold=args.threshold, category=args.category,
+                       tag=args.tag, variant=args.variant, db_path=args.db)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.columns:
+            unknown = [col for col in args.columns if col not in df.columns]
+            if unknown:
+                parser.error(f"Unknown column(s) {unknown} in table {args.name!r}; available: {list(df.columns)}")
+            df = df[["run_id", *args.columns]]
+        print(df.to_string(index=False))
+    elif args.command == "compare":
+        try:
+            df = compare_runs(args.name, args.column, args.run, on=args.on, db_path=args.db)
+        except ValueError as e:
+            parser.error(str(e))
+        print(df.to_string())
+
+if __name__ == "__main__":
+    main()
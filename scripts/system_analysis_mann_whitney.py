@@ -6,33 +6,20 @@ import seaborn as sns
 from scipy.stats import mannwhitneyu
 from statsmodels.stats.multitest import multipletests
 
+from data_loader import SYSTEM_STATS_FILES, load_inputs
+from outlier_filters import METHODS, SCOPES, sweep_filters, variant_name
+from result_store import record_table, start_run
+
 # Load the CSV files
-domain_raw = pd.read_csv('../data/word_system_stats_with_sloc_domain.csv')
-general_raw = pd.read_csv('../data/word_system_stats_with_sloc_general.csv')
+inputs = load_inputs(system_stats=['domain', 'general'])
+domain_raw = inputs.system_stats['domain']
+general_raw = inputs.system_stats['general']
 
 # --- Cleaning steps ---
 
 def remove_digits(df):
     return df[~df['word'].str.isdigit()]
 
-def remove_outliers(df):
-    mean = df['normalized_system_count'].mean()
-    std = df['normalized_system_count'].std()
-    lower_bound = mean - 3 * std
-    upper_bound = mean + 3 * std
-    return df[(df['normalized_system_count'] >= lower_bound) & (df['normalized_system_count'] <= upper_bound)]
-
-def filter_words_by_system_coverage(df, threshold):
-    total_systems = df['system'].nunique()
-    word_system_counts = df.groupby('word')['system'].nunique()
-    eligible_words = word_system_counts[word_system_counts >= (total_systems * threshold)].index
-    return df[df['word'].isin(eligible_words)]
-
-def safe_log_transform(df):
-    df = df.copy()
-    df['log_normalized_system_count'] = np.log10(df['normalized_system_count'] + 1e-8)
-    return df
-
 def cliffs_delta(x, y):
     n_x = len(x)
     n_y = len(y)
@@ -43,21 +30,41 @@ def cliffs_delta(x, y):
 # --- Run analysis for multiple thresholds ---
 
 thresholds = np.arange(0.0, 1.1, 0.1)
+categories_to_check = ['preposition', 'determiner', 'conjunction', 'digit']
 global_summary_results = []
 per_category_all_results = []
 
+# Outlier filter used for the main analysis (method, scope, k; k=None uses the
+# method's default), plus every variant compared in outlier_filter_comparison.csv
+outlier_variant = ('sigma', 'global', 3.0)
+filter_variants = [outlier_variant] + [
+    (method, scope, None) for method in METHODS for scope in SCOPES if (method, scope) != outlier_variant[:2]
+]
+
+# Outlier masks and word coverage are computed once per dataset and variant
+domain_filters = sweep_filters(domain_raw, filter_variants)
+general_filters = sweep_filters(general_raw, filter_variants)
+outlier_name = variant_name(*outlier_variant)
+
+run_id = start_run(
+    'system_analysis_mann_whitney.py',
+    {
+        'thresholds': [round(t, 2) for t in thresholds],
+        'categories': categories_to_check,
+        'outlier_filter': outlier_name,
+        'filter_variants': [variant_name(*v) for v in filter_variants],
+        'alternative': 'greater',
+        'fdr_method': 'fdr_bh',
+    },
+    inputs=[SYSTEM_STATS_FILES['domain'], SYSTEM_STATS_FILES['general']],
+)
+
 for threshold in thresholds:
     threshold = round(threshold, 2)
     print(f"\n=== Threshold: {threshold:.2f} ===")
 
-    domain_df = remove_outliers(domain_raw)
-    general_df = remove_outliers(general_raw)
-
-    domain_df = filter_words_by_system_coverage(domain_df, threshold)
-    general_df = filter_words_by_system_coverage(general_df, threshold)
-
-    domain_df = safe_log_transform(domain_df)
-    general_df = safe_log_transform(general_df)
+    domain_df = domain_filters[outlier_name].at(threshold)
+    general_df = general_filters[outlier_name].at(threshold)
 
     if domain_df.empty or general_df.empty:
         print("Skipped due to empty dataset after filtering.")
@@ -82,8 +89,6 @@ for threshold in thresholds:
     })
 
     # --- Per-Category Analysis ---
-    categories_to_check = ['preposition', 'determiner', 'conjunction', 'digit']
-
     for category in categories_to_check:
         domain_subset = domain_df[domain_df['categories'].str.contains(category, na=False)]
         general_subset = general_df[general_df['categories'].str.contains(category, na=False)]
@@ -122,12 +127,43 @@ global_summary_df = pd.DataFrame(global_summary_results)
 global_summary_df['fdr_corrected_p'] = multipletests(global_summary_df['p_value'], method='fdr_bh')[1]
 global_summary_df['neg_log10_p'] = -np.log10(global_summary_df['p_value'])
 global_summary_df.to_csv('../output/threshold_mannwhitney_summary_fdr.csv', index=False)
+record_table(run_id, 'threshold_mannwhitney_summary_fdr', global_summary_df)
 
 # Save all per-category results
 per_category_df = pd.DataFrame(per_category_all_results)
 per_category_df['fdr_corrected_p'] = multipletests(per_category_df['p_value'], method='fdr_bh')[1]
 per_category_df['neg_log10_p'] = -np.log10(per_category_df['p_value'])
 per_category_df.to_csv('../output/per_category_mannwhitney_summary_fdr.csv', index=False)
+record_table(run_id, 'per_category_mannwhitney_summary_fdr', per_category_df)
+
+# --- Compare outlier filter variants ---
+filter_comparison_results = []
+for name in domain_filters:
+    for threshold in thresholds:
+        threshold = round(threshold, 2)
+        domain_df = domain_filters[name].at(threshold)
+        general_df = general_filters[name].at(threshold)
+        if domain_df.empty or general_df.empty:
+            continue
+        stat, p_value = mannwhitneyu(
+            domain_df['log_normalized_system_count'],
+            general_df['log_normalized_system_count'],
+            alternative='greater'
+        )
+        filter_comparison_results.append({
+            'filter': name,
+            'threshold': threshold,
+            'domain_removed': len(domain_raw) - len(domain_filters[name].df),
+            'general_removed': len(general_raw) - len(general_filters[name].df),
+            'domain_count': len(domain_df),
+            'general_count': len(general_df),
+            'statistic': stat,
+            'p_value': p_value
+        })
+
+filter_comparison_df = pd.DataFrame(filter_comparison_results)
+filter_comparison_df.to_csv('../output/outlier_filter_comparison.csv', index=False)
+record_table(run_id, 'outlier_filter_comparison', filter_comparison_df, variant_col='filter')
 
 # --- Plot global p-values ---
 plt.figure(figsize=(10, 6))
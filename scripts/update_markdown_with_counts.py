@@ -1,9 +1,10 @@
 
-import pandas as pd
 import re
 from collections import Counter, defaultdict
 from pathlib import Path
 
+from data_loader import CATEGORIES, load_inputs
+
 # === Load & Prepare Data ===
 
 def summarize_counts_fixed(df, group_col, context_col='context', grammar_col='grammar pattern', lang_col='language'):
@@ -107,31 +108,32 @@ def patch_markdown(md_text, summary_dict, code_keys, language_counts):
 
 # === Example Usage ===
 
-digit_df = pd.read_csv("../data/Digit Axial Code Annotations - digit_axial_code_dual_axis.tsv", sep="\t")
-conj_df = pd.read_csv("../data/Conjunction Axial Code Annotations - conjunction_axial_codes_final.tsv", sep="\t")
-prep_df = pd.read_csv("../data/Preposition Axial Code Annotations - refined_axial_code_labels_updated.tsv", sep="\t")
-det_df = pd.read_csv("../data/Determiner Axial Code Anntoations - determiner_axial_code_validation.tsv", sep="\t")
+inputs = load_inputs(annotations=CATEGORIES, templates=CATEGORIES)
+digit_df = inputs.annotations["Digit"]
+conj_df = inputs.annotations["Conjunction"]
+prep_df = inputs.annotations["Preposition"]
+det_df = inputs.annotations["Determiner"]
 
 language_counts = compute_language_counts(digit_df, conj_df, prep_df, det_df)
 
 digit_df['code_key'] = digit_df['final_axial_code_role'].str.strip() + " x " + digit_df['final_axial_code_meaning'].str.strip()
 digit_summary = summarize_counts_fixed(digit_df, 'code_key')
-digit_md = Path("../data/Digit_Selective_Codes_Dual_Axis.md").read_text()
+digit_md = inputs.templates["Digit"]
 digit_keys = list(digit_summary.keys())
 patched_digit_md = patch_markdown(digit_md, digit_summary, digit_keys, language_counts)
 
 conj_summary = summarize_counts_fixed(conj_df, 'final_axial_code')
-conj_md = Path("../data/Conjunction_Selective_Code_Summary.md").read_text()
+conj_md = inputs.templates["Conjunction"]
 conj_keys = list(conj_summary.keys())
 patched_conj_md = patch_markdown(conj_md, conj_summary, conj_keys, language_counts)
 
 prep_summary = summarize_counts_fixed(prep_df, 'final_axial_code')
-prep_md = Path("../data/Preposition_Selective_Code_Summary.md").read_text()
+prep_md = inputs.templates["Preposition"]
 prep_keys = list(prep_summary.keys())
 patched_prep_md = patch_markdown(prep_md, prep_summary, prep_keys, language_counts)
 
 det_summary = summarize_counts_fixed(det_df, 'final_axial_code')
-det_md = Path("../data/Determiner_Selective_Code_Summary.md").read_text()
+det_md = inputs.templates["Determiner"]
 det_keys = list(det_summary.keys())
 patched_det_md = patch_markdown(det_md, det_summary, det_keys, language_counts)
 